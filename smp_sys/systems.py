@@ -77,6 +77,7 @@ TODO:
 #    outside the agent
 
 import copy
+import math
 from functools import partial
 import numpy as np
 from pprint import pformat
@@ -92,6 +93,62 @@ import logging
 from smp_base.common import get_module_logger
 logger = get_module_logger(modulename = 'systems', loglevel = logging.INFO)
 
+# module-level rng singleton shared by all systems: PCG64 beats the
+# legacy mersenne twister and Generator.standard_normal(out=) fills
+# preallocated buffers without reallocating
+_RNG = np.random.default_rng()
+
+def seed(s = None):
+    """(Re)seed the module-level rng serving all system noise"""
+    global _RNG
+    _RNG = np.random.default_rng(s)
+
+def _fill_normal(buf):
+    """fill `buf` with standard-normal samples in place"""
+    _RNG.standard_normal(out = buf, dtype = buf.dtype)
+
+# numba is optional: hot loops get compiled kernels when it is
+# available and fall back to plain numpy otherwise
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError as e:
+    HAVE_NUMBA = False
+
+if HAVE_NUMBA:
+    @njit(cache = True, fastmath = True)
+    def _pm_step(X, U, inv_mass, decay, dt, sysnoise, sysdim, bias, noise):
+        """compiled pointmass integrator, one in-place euler step over the batch
+
+        Plain scalar loops over agents and dimensions, numba turns these
+        into tight native code without any numpy dispatch per step.
+        """
+        for n in range(X.shape[0]):
+            for i in range(sysdim):
+                a = U[n,i] * inv_mass + bias[n,i]
+                v = X[n,sysdim+i] * decay + a * dt
+                X[n,i] += v * dt
+                X[n,sysdim+i] = v
+                X[n,sysdim*2+i] = a
+            for i in range(sysdim * 3):
+                X[n,i] += sysnoise * noise[n,i]
+
+    @njit(cache = True, fastmath = True)
+    def _fk_end(a, L):
+        """compiled end-effector forward kinematics
+
+        Straight-line accumulator loop over the joints, no temporaries
+        and no cumsum passes.
+        """
+        s = 0.0
+        x = 0.0
+        y = 0.0
+        for i in range(a.shape[0]):
+            s += a[i]
+            x += math.cos(s) * L[i]
+            y += math.sin(s) * L[i]
+        return x, y
+
 # dummy block ref
 class bla(object):
     pass
@@ -118,7 +175,16 @@ class SMPSys(object):
 
     Arguments:
      - conf(dict): configuration dictionary
+
+    Attribute storage is __slots__ based for fast lookup and compact
+    instances (matters with many batched systems). Subclasses that
+    don't declare their own __slots__ (e.g. :class:`Pointmass2Sys`)
+    fall back to a per-instance __dict__ and stay fully dynamic.
     """
+    __slots__ = (
+        'conf', 'order', 'dims', 'mem', 'cnt', 'ros', 'subs', 'pubs',
+        '_noise_buf', '_noise_idx')
+
     defaults = {
         'order': 0,
         'dims': {
@@ -137,22 +203,55 @@ class SMPSys(object):
         # update with instance conf
         self.conf.update(conf)
         
-        # copy self.conf to self attributes
-        self.__dict__.update(copy.deepcopy(self.conf))
-        
-        # for k, v in self.conf.items():
-        #     setattr(self, k, v)
-        #     # print "%s.init self.%s = %s" % (self.__class__.__name__, k, v)
+        # copy self.conf to self attributes; on __slots__-only classes
+        # unknown conf keys are dropped (debug-logged) instead of
+        # landing in a per-instance __dict__
+        for k, v in list(copy.deepcopy(self.conf).items()):
+            try:
+                setattr(self, k, v)
+            except AttributeError:
+                logger.debug("%s.init dropping conf key %s, not declared in __slots__", self.__class__.__name__, k)
+            # print "%s.init self.%s = %s" % (self.__class__.__name__, k, v)
 
         # FIXME: check for sensorimotor delay configuration
         # FIXME: check for motor range configuration
-            
+
+        # pre-generated standard-normal ring buffer: per-step noise is
+        # served from bulk-generated randomness via _noise() instead of
+        # paying prng setup + allocation for a handful of floats per step
+        self._noise_buf = np.empty((16384, ), dtype = getattr(self, 'dtype', np.float64))
+        _fill_normal(self._noise_buf)
+        self._noise_idx = 0
+
         # ROS
         if hasattr(self, 'ros') and self.ros:
             # rospy.init_node(self.name)
             self.subs = {}
             self.pubs = {}
             
+    def _noise(self, shape):
+        """SMPSys._noise
+
+        Return standard-normal noise of `shape` served from the
+        pre-generated ring buffer, refilling the buffer in bulk when it
+        is exhausted.
+
+        :param tuple shape: shape of the requested noise array
+
+        :returns: numpy.ndarray view of shape `shape` into the buffer
+        """
+        n = int(np.prod(shape))
+        # oversized request (large batches): generate directly
+        if n > self._noise_buf.size:
+            return _RNG.standard_normal(shape, dtype = self._noise_buf.dtype)
+        # refill in bulk when exhausted
+        if self._noise_idx + n > self._noise_buf.size:
+            _fill_normal(self._noise_buf)
+            self._noise_idx = 0
+        r = self._noise_buf[self._noise_idx:self._noise_idx + n].reshape(shape)
+        self._noise_idx += n
+        return r
+
     def step(self, x):
         """SMPSys.step
 
@@ -198,10 +297,17 @@ class PointmassSys(SMPSys):
      - statedim: 1d pointmass has 3 variables (pos, vel, acc) in this model, so sysdim * 3
      - dt: integration time step
      - x0: initial state
+     - N: batch size, number of agents simulated in lock-step [1]
      - order: NOT IMPLEMENT (control mode of the system, order = 0 kinematic, 1 velocity, 2 force)
 
-    Missing: noise, motor aberration, transfer funcs, ...
+    Missing: motor aberration, transfer funcs, ...
     """
+    __slots__ = (
+        'sysdim', 'x0', 'statedim', 'dt', 'mass', 'force_max',
+        'force_min', 'friction', 'sysnoise', 'N', 'dtype', 'X', 'x',
+        '_inv_mass', '_decay', '_dt', '_noise_scale', '_step_kernel',
+        '_out', '_mbuf')
+
     defaults = {
         'sysdim': 1,
         'x0': np.random.uniform(-0.3, 0.3, (3, 1)),
@@ -212,93 +318,209 @@ class PointmassSys(SMPSys):
         "force_min": -1.0,
         "friction": 0.001,
         "sysnoise": 1e-2,
+        'N': 1,
+        # single precision halves bytes moved per step in batch mode,
+        # ample for a toy dynamic model
+        'dtype': np.float32,
         }
-    
+
     def __init__(self, conf = {}):
         """Pointmass.__init__
         """
         SMPSys.__init__(self, conf)
-        
-        # state is (pos, vel, acc).T
-        # self.state_dim
+
+        # state is (pos, vel, acc).T per agent, stored structure-of-arrays
+        # style as X[agent, pos|vel|acc] with agents along the first axis,
+        # so that one numpy call per step updates the entire batch
         # if not hasattr(self, 'x0'):
         #     self.x0 = np.zeros((self.statedim, 1))
-        self.x  = self.x0.copy()
+        self.X = np.tile(np.asarray(self.x0, dtype = self.dtype).reshape((1, -1)), (self.N, 1))
+        # flat single-agent view onto agent 0, the sensor getters reshape
+        # this back into the legacy (statedim, 1) column interface
+        self.x = self.X[0]
         self.cnt = 0
 
+        # precomputed scalar constants for the step hot path, saves a
+        # division and repeated __dict__ lookups per step
+        self._inv_mass = 1.0/self.mass
+        self._decay = 1.0 - self.friction
+        self._dt = self.dt
+        self._noise_scale = self.sysnoise
+
+        # runtime-specialized single-agent integrator, see _make_step_kernel
+        self._step_kernel = self._make_step_kernel()
+
+        # reused step output dict, see step
+        self._out = {'s_proprio': None, 's_extero': None, 's_all': None}
+
+        # lazily sized motor bounding buffer, see bound_motor
+        self._mbuf = None
+
+    def _make_step_kernel(self):
+        """PointmassSys._make_step_kernel
+
+        Generate a straight-line single-agent integrator specialized for
+        this instance's sysdim and scalar constants (partial
+        evaluation). The sysdim loop is unrolled into per-dimension
+        statements and all constants are baked into the source before
+        exec, so the resulting function has no loop, slice or attribute
+        overhead left. Used by apply_force on the N = 1 path when numba
+        is not available.
+        """
+        s = self.sysdim
+        lines = ['def _step(x, u, bias):']
+        for i in range(s):
+            lines.append('    x[%d] = u[%d] * %r + bias[%d]' % (s*2+i, i, self._inv_mass, i))
+            lines.append('    x[%d] = x[%d] * %r + x[%d] * %r' % (s+i, s+i, self._decay, s*2+i, self._dt))
+            lines.append('    x[%d] = x[%d] + x[%d] * %r' % (i, i, s+i, self._dt))
+        ns = {}
+        exec('\n'.join(lines), ns)
+        return ns['_step']
+
     def reset(self):
-        self.x = self.x0.copy()
-        
+        self.X[...] = self.x0.reshape((1, -1))
+
     def step(self, x = None, world = None):
         """PointmassSys.step
 
         Update the robot, pointmass
+
+        .. note:: the returned dict and its arrays are reused across
+                  steps, callers that keep results need to `.copy()`
+                  them.
         """
         # print "%s.step[%d] x = %s" % (self.__class__.__name__, self.cnt, x)
         # x = self.inputs['u'][0]
         self.apply_force(x)
-        # return dict of state values
-        return {'s_proprio': self.compute_sensors_proprio(),
-                's_extero':  self.compute_sensors_extero(),
-                's_all':     self.compute_sensors(),
-        }
+        # update reused dict of state values
+        o = self._out
+        o['s_proprio'] = self.compute_sensors_proprio()
+        o['s_extero']  = self.compute_sensors_extero()
+        o['s_all']     = self.compute_sensors()
+        return o
         
     def bound_motor(self, m):
-        return np.clip(m, self.force_min, self.force_max)
+        """bound the motor values to force_min/max in a reused buffer"""
+        m = np.asarray(m)
+        if self._mbuf is None or self._mbuf.shape != m.shape:
+            self._mbuf = np.empty_like(m)
+        np.minimum(m, self.force_max, out = self._mbuf)
+        np.maximum(self._mbuf, self.force_min, out = self._mbuf)
+        return self._mbuf
 
     def apply_force(self, u):
-        """control pointmass with force command (2nd order)"""
+        """control pointmass with force command (2nd order), batched over all N agents"""
         # print "u", u, self.mass, u/self.mass
         # FIXME: insert motor transfer function
-        a = (u/self.mass).reshape((self.sysdim, 1))
+        # bind hot-path constants to locals once
+        s = self.sysdim
+        X = self.X
+        dt = self._dt
+        decay = self._decay
+        inv_m = self._inv_mass
+        # single command rows broadcast over the batch
+        u1 = np.broadcast_to(np.asarray(u, dtype = X.dtype).reshape((-1, s)), (self.N, s))
         # a = (u/self.mass).reshape((self.sysdim, 1)) - self.x[:self.sysdim,[0]] * 0.025 # experimental for homeokinesis hack
         # a += np.random.normal(0.05, 0.01, a.shape)
 
-        # world modification
-        if np.any(self.x[:self.sysdim] > 0):
-            a += np.random.normal(0.05, 0.01, a.shape)
+        # world modification, per agent depending on its position sign
+        bias = np.where(
+            np.any(X[:,:s] > 0, axis = 1, keepdims = True),
+            _RNG.normal( 0.05, 0.01, (self.N, s)),
+            _RNG.normal(-0.1,  0.01, (self.N, s)))
+
+        noise = self._noise(X.shape)
+
+        if HAVE_NUMBA:
+            _pm_step(
+                X, np.ascontiguousarray(u1), inv_m, decay,
+                dt, self._noise_scale, s, bias, noise)
+        elif self.N == 1:
+            # specialized straight-line kernel plus one batched noise add
+            self._step_kernel(self.x, u1[0], bias[0])
+            X += self._noise_scale * noise
         else:
-            a += np.random.normal(-0.1, 0.01, a.shape)
-            
-        # print("a.shape", a.shape)
-        # print "a", a, self.x[self.conf.s_ndims/2:]
-        v = self.x[self.sysdim:self.sysdim*2] * (1 - self.friction) + a * self.dt
-        
-        # self.a_ = a.copy()
-        
-        
-        # # world modification
-        # v += np.sin(self.cnt * 0.01) * 0.05
-        
-        # print "v", v
-        p = self.x[:self.sysdim] + v * self.dt
+            # update the (a, v, p) column blocks in place, old acceleration
+            # is dead at this point so it doubles as the output buffer
+            np.multiply(u1, inv_m, out = X[:,s*2:])
+            X[:,s*2:] += bias
+            np.multiply(X[:,s:s*2], decay, out = X[:,s:s*2])
+            X[:,s:s*2] += X[:,s*2:] * dt
+            X[:,:s] += X[:,s:s*2] * dt
 
-        # collect temporary state description (p,v,a) into joint state vector x
-        self.x[:self.sysdim] = p.copy()
-        self.x[self.sysdim:self.sysdim*2] = v.copy()
-        self.x[self.sysdim*2:] = a.copy()
+            # # world modification
+            # v += np.sin(self.cnt * 0.01) * 0.05
+
+            # apply noise, one call for the whole batch
+            X += self._noise_scale * noise
 
-        # apply noise
-        # self.x += self.sysnoise * np.random.randn(self.x.shape[0], self.x.shape[1])
-        
         # print "self.x[2,0]", self.x[2,0]
 
         # self.scale()
-        # self.pub()                
+        # self.pub()
         self.cnt += 1
-        
+
         # return x
         # self.x = x # pointmasslib.simulate(self.x, [u], self.dt)
 
+    def rollout(self, U):
+        """PointmassSys.rollout
+
+        Closed-form rollout over a whole force trajectory. The (v, p)
+        update is an affine recurrence with constant coefficients, so
+        with all forces known up front it reduces to one IIR filter
+        along time for the velocity (scipy.signal.lfilter, python loop
+        fallback when scipy is missing) plus one cumsum for the
+        position - O(1) numpy dispatches instead of T step calls.
+
+        Deterministic closed form: the state-dependent world
+        modification bias of :meth:`apply_force` does not enter, and the
+        system noise is added to the returned trajectory as observation
+        noise only instead of feeding back through the recurrence.
+
+        :param numpy.ndarray U: force trajectory of shape (T, sysdim)
+
+        :returns: state trajectory of shape (T, 3*sysdim) with (p|v|a)
+                  column blocks; the final row is written back to agent
+                  0's state
+        """
+        s = self.sysdim
+        U = np.asarray(U, dtype = self.X.dtype).reshape((-1, s))
+        T = U.shape[0]
+        a = U * self._inv_mass
+        w = self._decay
+        dt = self._dt
+        v0 = self.x[s:s*2].copy()
+        p0 = self.x[:s].copy()
+        try:
+            from scipy.signal import lfilter
+            # v_t = w * v_{t-1} + dt * a_t, forced part
+            V = lfilter([dt], [1.0, -w], a, axis = 0)
+        except ImportError:
+            V = np.empty_like(a)
+            v = np.zeros_like(v0)
+            for t in range(T):
+                v = v * w + a[t] * dt
+                V[t] = v
+        # homogeneous part carrying the initial velocity
+        V += v0 * (w ** np.arange(1, T + 1))[:,None]
+        P = p0 + dt * np.cumsum(V, axis = 0)
+        traj = np.hstack((P, V, a)).astype(self.X.dtype, copy = False)
+        traj += self._noise_scale * self._noise(traj.shape)
+        # adopt the final state
+        self.x[...] = traj[-1]
+        self.cnt += T
+        return traj
+
     def compute_sensors_proprio(self):
-        return self.x[self.sysdim*2:]
-    
+        return self.x[self.sysdim*2:].reshape((-1, 1))
+
     def compute_sensors_extero(self):
-        return self.x[self.sysdim:self.sysdim*2]
-    
+        return self.x[self.sysdim:self.sysdim*2].reshape((-1, 1))
+
     def compute_sensors(self):
         """compute the proprio and extero sensor values from state"""
-        return self.x
+        return self.x.reshape((-1, 1))
 
 class Pointmass2Sys(SMPSys):
     """Pointmass2Sys
@@ -585,7 +807,7 @@ class Pointmass2Sys(SMPSys):
             u = {'m%d' % (self.order_motor, ): u.copy()}
 
         # compute acceleration noise
-        self.anoise = np.random.normal(self.anoise_mean, self.anoise_std, size = (1, self.sysdim))
+        self.anoise = _RNG.normal(self.anoise_mean, self.anoise_std, size = (1, self.sysdim))
 
         # apply motor delay / lag
         # iterate over motor groups (vectors) of motor variables
@@ -857,8 +1079,33 @@ def forward(angles, lengths):
 
     .. warning:: angles and lengths should be the same size.
     """
-    x, y = joint_positions(angles, lengths)
-    return x[-1], y[-1]
+    return forward_fast(angles, lengths)
+
+def forward_fast(angles, lengths):
+    """Fused end-effector forward kinematics
+
+    Same chain as :func:`joint_positions` but computes only the
+    end-effector position with a single combined (2, n) sin/cos table
+    and one cumsum pass, avoiding the per-call temporaries of the
+    joint-positions variant.
+
+    :param list angles: angles of each joint
+
+    :param list lengths: length of each segment
+
+    :returns: a tuple (x, y) of the end-effector position
+    """
+    if HAVE_NUMBA:
+        return _fk_end(
+            np.ascontiguousarray(np.asarray(angles, dtype = np.float64).ravel()),
+            np.ascontiguousarray(np.asarray(lengths, dtype = np.float64)))
+    a = np.cumsum(np.asarray(angles, dtype = np.float64).ravel())
+    cs = np.empty((2, a.size))
+    np.cos(a, out = cs[0])
+    np.sin(a, out = cs[1])
+    cs *= lengths
+    cs.cumsum(axis = 1, out = cs)
+    return cs[0,-1], cs[1,-1]
 
 def joint_positions(angles, lengths, unit='rad'):
     """ Link object as defined by the standard DH representation.
@@ -882,9 +1129,15 @@ def joint_positions(angles, lengths, unit='rad'):
         a = np.pi * np.array(angles)
     else:
         raise NotImplementedError
-     
+
     a = np.cumsum(a)
-    return np.cumsum(np.cos(a)*lengths), np.cumsum(np.sin(a)*lengths)
+    # combined (2, n) sin/cos table, one cumsum pass instead of two
+    cs = np.empty((2, a.size))
+    np.cos(a, out = cs[0])
+    np.sin(a, out = cs[1])
+    cs *= lengths
+    cs.cumsum(axis = 1, out = cs)
+    return cs[0], cs[1]
 
 class SimplearmSys(SMPSys):
     """SimplearmSys
@@ -893,6 +1146,12 @@ class SimplearmSys(SMPSys):
 
     an n-joint / n-1 segment generative robot
     """
+    __slots__ = (
+        'sysdim', 'x0', 'statedim', 'dt', 'lag', 'mass', 'force_max',
+        'force_min', 'friction', 'sysnoise', 'dim_s_proprio',
+        'length_ratio', 'm_mins', 'm_maxs', 'dim_s_extero', 'dtype',
+        'x', 'u_delay', 'factor', 'lengths', 'm', '_hand', '_proprio',
+        '_out', '_mbuf', '_sall', '_sall_p', '_sall_e')
 
     defaults = {
         'sysdim': 1,
@@ -910,6 +1169,9 @@ class SimplearmSys(SMPSys):
         'm_mins': -1,
         'm_maxs': 1,
         'dim_s_extero': 2,
+        # single precision halves bytes moved per step in batch mode,
+        # ample for a toy kinematic model
+        'dtype': np.float32,
         }
     
     def __init__(self, conf = {}):
@@ -936,21 +1198,38 @@ class SimplearmSys(SMPSys):
         # self.state_dim
         if not hasattr(self, 'x0'):
             self.x0 = np.zeros((self.statedim, 1))
-        self.x  = self.x0.copy()
+        self.x  = self.x0.astype(self.dtype)
         self.cnt = 0
 
         # command buffer to simulate motor delay
-        self.u_delay = np.zeros((self.dim_s_proprio, self.lag + 1))
+        self.u_delay = np.zeros((self.dim_s_proprio, self.lag + 1), dtype = self.dtype)
 
         self.factor = 1.0
 
-        self.lengths = self.compute_lengths(self.dim_s_proprio, self.length_ratio)
+        self.lengths = self.compute_lengths(self.dim_s_proprio, self.length_ratio).astype(self.dtype, copy = False)
+
+        self.m = np.zeros((self.dim_s_proprio, 1), dtype = self.dtype)
+
+        # preallocated sensor output buffers, overwritten on every call
+        # of the compute_sensors_* getters
+        self._hand = np.empty((self.dim_s_extero, 1), dtype = self.dtype)
+        self._proprio = np.empty_like(self.m)
+
+        # reused step output dict, see step
+        self._out = {'s_proprio': None, 's_extero': None, 's_all': None}
+
+        # preallocated motor bounding buffer, see compute_motor_command
+        self._mbuf = np.empty_like(self.m)
+
+        # fused sensor vector: proprio and extero are computed directly
+        # into slice views of one preallocated s_all column
+        self._sall = np.empty((self.dim_s_proprio + self.dim_s_extero, 1), dtype = self.dtype)
+        self._sall_p = self._sall[:self.dim_s_proprio]
+        self._sall_e = self._sall[self.dim_s_proprio:]
 
-        self.m = np.zeros((self.dim_s_proprio, 1))
-        
     def reset(self):
         """SimplearmSys.reset"""
-        self.x = self.x0.copy()
+        self.x = self.x0.astype(self.dtype)
         
     # def step(self, x = None, world = None):
     #     """update the robot, pointmass"""
@@ -972,54 +1251,125 @@ class SimplearmSys(SMPSys):
         return l / sum(l)
 
     def compute_motor_command(self, m):
-        """SimplearmSys.reset"""
-        m *= self.factor
+        """SimplearmSys.compute_motor_command
+
+        scale and bound the motor command into a reused buffer, leaving
+        the caller's array untouched
+        """
+        buf = self._mbuf
+        np.multiply(np.asarray(m, dtype = self.dtype).reshape(buf.shape), self.factor, out = buf)
         # print "m", m.shape, "m_mins", self.m_mins, "m_maxs", self.m_maxs
-        ret = np.clip(m.T, self.m_mins, self.m_maxs).T
+        # bound on the transposed view so per-dimension m_mins/m_maxs broadcast
+        bT = buf.T
+        np.minimum(bT, self.m_maxs, out = bT)
+        np.maximum(bT, self.m_mins, out = bT)
         # print "ret.shape", ret.shape
-        return ret
+        return buf
 
-    def compute_sensors_proprio(self):
-        """SimplearmSys.reset"""
-        # hand_pos += 
-        return self.m + self.sysnoise * np.random.randn(*self.m.shape)
+    def compute_sensors_proprio(self, out = None):
+        """SimplearmSys.compute_sensors_proprio"""
+        buf = self._proprio if out is None else out
+        buf[...] = self.m
+        buf += self.sysnoise * self._noise(buf.shape)
+        return buf
 
     def step(self, x):
-        """SimplearmSys.reset
+        """SimplearmSys.step
 
         update the robot, pointmass
+
+        .. note:: the returned dict and its arrays are reused across
+                  steps, callers that keep results need to `.copy()`
+                  them.
         """
         # print "%s.step x = %s" % (self.__class__.__name__, x)
         # print "x", x.shape
+        self.step_motor(x)
+
+        # print "m", m
+        # self.apply_force(x)
+        # compute each modality once, directly into the slice views of
+        # the fused s_all buffer, no vstack copy per step
+        o = self._out
+        o['s_proprio'] = self.compute_sensors_proprio(out = self._sall_p)
+        o['s_extero']  = self.compute_sensors_extero(out = self._sall_e)
+        o['s_all']     = self._sall
+        return o
+
+    def step_motor(self, x):
+        """SimplearmSys.step_motor
+
+        motor-only part of :meth:`step`: bound the command, feed the
+        delay line and return the measured (delayed) motor value. Lets
+        callers run the cheap motor recurrence per step and defer the
+        sensor computation to one batched pass, see :meth:`step_batch`.
+        """
         # self.m = self.compute_motor_command(self.m + x)# .reshape((self.dim_s_proprio, 1))
         self.m = self.compute_motor_command(x)# .reshape((self.dim_s_proprio, 1))
-        
+
         self.u_delay[...,[0]] = self.m.copy()
         self.m = self.u_delay[...,[-1]]
         self.u_delay = np.roll(self.u_delay, shift = 1, axis = 1)
-        
-        # print "m", m
-        # self.apply_force(x)
+        return self.m
+
+    def step_batch(self, M):
+        """SimplearmSys.step_batch
+
+        Batched variant of :meth:`step`: apply a whole block of motor
+        commands at once and compute all end-effectors with one
+        vectorized kinematic pass over axis 1, instead of B python-level
+        step calls. The per-step motor delay line is skipped and noise
+        is drawn once per modality for the entire block.
+
+        :param numpy.ndarray M: motor command block, shape (B, dim_s_proprio)
+
+        :returns: dict with 's_proprio' (B, dim_s_proprio), 's_extero'
+                  (B, dim_s_extero) and 's_all' (B, dim_s_proprio + dim_s_extero)
+        """
+        M = np.clip(np.asarray(M, dtype = self.dtype) * self.factor, self.m_mins, self.m_maxs)
+        # batched forward kinematics, rows are configurations
+        A = np.cumsum(M, axis = 1)
+        C = np.cos(A)
+        S = np.sin(A)
+        C *= self.lengths
+        S *= self.lengths
+        hand = np.stack((C.cumsum(axis = 1)[:,-1], S.cumsum(axis = 1)[:,-1]), axis = 1)
+        sp = M + self.sysnoise * self._noise(M.shape)
+        se = hand + self.sysnoise * self._noise(hand.shape)
         return {
-            # "s_proprio": self.m,
-            's_proprio': self.compute_sensors_proprio(),
-            "s_extero":  self.compute_sensors_extero(),
-            's_all':     self.compute_sensors(),
+            's_proprio': sp,
+            's_extero':  se,
+            's_all':     np.hstack((sp, se)),
             }
 
-    def compute_sensors_extero(self):
-        """SimplearmSys.reset"""
+    def compute_sensors_extero(self, out = None):
+        """SimplearmSys.compute_sensors_extero"""
         # print "m.shape", self.m.shape, "lengths", self.lengths
-        hand_pos = np.array(forward(self.m, self.lengths)).reshape((self.dim_s_extero, 1))
-        hand_pos += self.sysnoise * np.random.randn(*hand_pos.shape)
+        x, y = forward_fast(self.m, self.lengths)
+        hand_pos = self._hand if out is None else out
+        hand_pos[0,0] = x
+        hand_pos[1,0] = y
+        hand_pos += self.sysnoise * self._noise(hand_pos.shape)
         # print "hand_pos", hand_pos.shape
         return hand_pos
 
-    def compute_sensors(self):
-        """SimplearmSys.reset"""
-        """compute the proprio and extero sensor values from state"""
+    def compute_sensors(self, sp = None, se = None):
+        """SimplearmSys.compute_sensors
+
+        compute the proprio and extero sensor values from state into
+        the fused preallocated s_all buffer, reusing already computed
+        modality values when passed in
+        """
+        if sp is None:
+            self.compute_sensors_proprio(out = self._sall_p)
+        elif sp is not self._sall_p:
+            self._sall_p[...] = sp
+        if se is None:
+            self.compute_sensors_extero(out = self._sall_e)
+        elif se is not self._sall_e:
+            self._sall_e[...] = se
         # return np.vstack((self.m, self.compute_sensors_extero()))
-        return np.vstack((self.compute_sensors_proprio(), self.compute_sensors_extero()))
+        return self._sall
         # return self.x
     
 # class SimpleArmRobot(Robot2):
@@ -1083,27 +1433,39 @@ if __name__ == "__main__":
     for c_i, c in enumerate(sysclasses):
         print("class", c)
         c_ = c(conf = c.defaults)
-        c_data = []
-
-        # minimal stepping
-        for i in range(1000):
-            # do proprio feedback
-            x = c_.compute_sensors_proprio() * 0.1
-            # print "x", x
-            # step system with feedback input
-            d = c_.step(x = np.roll(x, shift = 1) * -1.0)['s_all'].copy()
-            # print "d", d.shape
-            c_data.append(d)
+
+        if isinstance(c_, SimplearmSys):
+            # vectorized time-axis execution: per step only the cheap
+            # motor recurrence runs, kinematics and noise for the whole
+            # trajectory are computed in one batched pass at the end
+            M = np.empty((1000, c_.dim_s_proprio))
+            for i in range(1000):
+                # do proprio feedback
+                x = c_.compute_sensors_proprio() * 0.1
+                M[i] = c_.step_motor(np.roll(x, shift = 1) * -1.0).ravel()
+            c_data = c_.step_batch(M)['s_all']
+        else:
+            # minimal stepping
+            c_data = []
+            for i in range(1000):
+                # do proprio feedback
+                x = c_.compute_sensors_proprio() * 0.1
+                # print "x", x
+                # step system with feedback input
+                d = c_.step(x = np.roll(x, shift = 1) * -1.0)['s_all'].copy()
+                # print "d", d.shape
+                c_data.append(d)
+            # remove additional last axis
+            c_data = np.array(c_data)[...,0]
 
         # print(c_data)
         # print np.array(c_data).shape
         print(pformat(list(c_.x)))
-        print(pformat(list(d)))
+        print(pformat(list(c_data[-1])))
 
         ax = fig.add_subplot(1, len(sysclasses), c_i + 1)
-        # remove additional last axis
         ax.set_title(c.__name__)
-        ax.plot(np.array(c_data)[...,0])
+        ax.plot(c_data)
         plt.draw()
 
     plt.ioff()